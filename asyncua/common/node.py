@@ -447,12 +447,15 @@ class Node:
                 refs=ua.ObjectIds.HierarchicalReferences, direction=ua.BrowseDirection.Inverse
             )
             if len(refs) > 0:
-                path.insert(0, refs[0])
+                # collected from the node up to root, reversed once at the end
+                path.append(refs[0])
                 node = Node(self.server, refs[0].NodeId)
                 if len(path) >= (max_length - 1):
-                    return path
+                    break
             else:
-                return path
+                break
+        path.reverse()
+        return path
 
     async def get_parent(self):
         """
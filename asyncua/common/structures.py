@@ -4,65 +4,121 @@ We only support a subset of features but should be enough
 for custom structures
 """
 
+import io
 import re
 import uuid
+import asyncio
 import logging
+import linecache
+from functools import lru_cache
+from itertools import count
+from collections import OrderedDict
 # The next two imports are for generated code
 from datetime import datetime
 from enum import Enum, IntEnum, EnumMeta
 from lxml import objectify
 
 from asyncua import ua
+from .ua_utils import get_nodes_references
 
 _logger = logging.getLogger(__name__)
 
+# classes already generated from an identical definition, see _generate_python_class
+# {cache_key: (class, file name of its code)}, least recently used first
+_CLASS_CACHE = OrderedDict()
+_CLASS_CACHE_SIZE = 1024
+# numbers the file names of generated code, see _compile_code
+_CODE_COUNTER = count(1)
+
+_NON_WORD_RE = re.compile(r'\W+')
+_LEADING_DIGIT_RE = re.compile(r'^[0-9]+')
+
+
+_NUMERIC_UATYPES = frozenset({
+    "Int16", "Int32", "Int64",
+    "UInt16", "UInt32", "UInt64",
+    "Double", "Float", "Byte", "SByte",
+})
+_BYTES_UATYPES = frozenset({"ByteString", "CharArray", "Char"})
+
+# default value (code) of builtin types, a single dict lookup per field
+_DEFAULTS = {
+    "String": "None",
+    "Guid": "uuid.uuid4()",
+    "Boolean": "True",
+    "DateTime": "datetime.utcnow()",
+}
+_DEFAULTS.update(dict.fromkeys(_BYTES_UATYPES, b''))
+_DEFAULTS.update(dict.fromkeys(_NUMERIC_UATYPES, 0))
+
 
 def get_default_value(uatype, enums):
-    if uatype == "String":
-        return "None"
-    elif uatype == "Guid":
-        return "uuid.uuid4()"
-    elif uatype in ("ByteString", "CharArray", "Char"):
-        return b''
-    elif uatype == "Boolean":
-        return "True"
-    elif uatype == "DateTime":
-        return "datetime.utcnow()"
-    elif uatype in ("Int16", "Int32", "Int64", "UInt16", "UInt32", "UInt64", "Double", "Float", "Byte", "SByte"):
-        return 0
-    elif uatype in enums:
+    v = _DEFAULTS.get(uatype)
+    if v is not None:
+        return v
+    if uatype in enums:
         return f"ua.{uatype}({enums[uatype]})"
-    elif hasattr(ua, uatype) and issubclass(getattr(ua, uatype), Enum):
+    return _enum_default(uatype)
+
+
+@lru_cache(maxsize=512)
+def _enum_default(uatype):
+    """
+    Default value expression for a type looked up in the ua namespace.
+    Cached, call _enum_default.cache_clear() when new enums are added to ua
+    """
+    cls = getattr(ua, uatype, None)
+    if isinstance(cls, type) and issubclass(cls, Enum):
         # We have an enum, try to initilize it correctly
-        val = list(getattr(ua, uatype).__members__)[0]
+        val = next(iter(cls.__members__))
         return f"ua.{uatype}.{val}"
-    else:
-        return f"ua.{uatype}()"
+    return f"ua.{uatype}()"
 
 
-class EnumType(object):
-    def __init__(self, name):
-        self.name = name
-        self.fields = []
-        self.typeid = None
+_ENUM_TEMPLATE = """
 
-    def get_code(self):
-        code = """
+class {name}(IntEnum):
 
-class {0}(IntEnum):
+    '''
+    {name} EnumInt autogenerated from xml
+    '''
+
+{values}"""
+
+_STRUCT_TEMPLATE = """
+
+class {name}(object):
 
     '''
-    {0} EnumInt autogenerated from xml
+    {name} structure autogenerated from xml
     '''
 
-""".format(self.name)
+    __slots__ = {slots}
+
+    ua_types = [
+{ua_types}    ]
+    def __str__(self):
+        vals = [name + ": " + str(getattr(self, name)) for name in self.__slots__]
+        return self.__class__.__name__ + "(" + ", ".join(vals) + ")"
+
+    __repr__ = __str__
+
+    def __init__(self):
+{init}"""
+
+
+class EnumType(object):
+    def __init__(self, name):
+        self.name = name
+        self.fields = []
+        self.typeid = None
 
-        for EnumeratedValue in self.fields:
-            name = EnumeratedValue.Name
-            value = EnumeratedValue.Value
-            code += "    {} = {}\n".format(name, value)
+    def cache_key(self):
+        return ("enum", self.name, tuple((field.Name, field.Value) for field in self.fields))
 
-        return code
+    def get_code(self):
+        values = "".join(f"    {field.Name} = {field.Value}\n" for field in self.fields)
+        return _ENUM_TEMPLATE.format(name=self.name, values=values)
 
 
 class EnumeratedValue(object):
@@ -84,38 +140,34 @@ class Struct(object):
         return "Struct(name={}, fields={}".format(self.name, self.fields)
     __repr__ = __str__
 
-    def get_code(self):
-        code = f"""
-
-class {self.name}(object):
-
-    '''
-    {self.name} structure autogenerated from xml
-    '''
-
-"""
-        code += '    ua_types = [\n'
+    def _field_entries(self):
+        """
+        return a list of (name, uatype, default value) used to render the class
+        """
+        entries = []
         for field in self.fields:
             prefix = 'ListOf' if field.array else ''
             uatype = prefix + field.uatype
             if uatype == 'ListOfChar':
                 uatype = 'String'
-            code += f"        ('{field.name}', '{uatype}'),\n"
-        code += "    ]"
-        code += """
-    def __str__(self):
-        vals = [name + ": " + str(val) for name, val in self.__dict__.items()]
-        return self.__class__.__name__ + "(" + ", ".join(vals) + ")"
+            entries.append((field.name, uatype, field.value))
+        return entries
 
-    __repr__ = __str__
+    def cache_key(self):
+        fields = tuple((name, uatype, repr(value)) for name, uatype, value in self._field_entries())
+        return ("struct", self.name, fields)
 
-    def __init__(self):
-"""
-        if not self.fields:
-            code += "      pass"
-        for field in self.fields:
-            code += f"        self.{field.name} = {field.value}\n"
-        return code
+    def get_code(self):
+        slots = []
+        ua_types = []
+        init = []
+        # a single pass over the fields renders the __slots__, ua_types and __init__ lines
+        for name, uatype, value in self._field_entries():
+            slots.append(name)
+            ua_types.append(f"        ('{name}', '{uatype}'),\n")
+            init.append(f"        self.{name} = {value}\n")
+        return _STRUCT_TEMPLATE.format(name=self.name, slots=repr(tuple(slots)), ua_types="".join(ua_types),
+                                       init="".join(init) if init else "      pass")
 
 
 class Field(object):
@@ -164,15 +216,13 @@ class StructGenerator(object):
                     array = True
                     continue
                 field = Field(_clean_name(name))
-                field.uatype = xmlfield.get("TypeName")
-                if ":" in field.uatype:
-                    field.uatype = field.uatype.split(":")[1]
-                field.uatype = _clean_name(field.uatype)
-                field.value = get_default_value(field.uatype, enums)
+                field.uatype = _resolve_uatype(xmlfield.get("TypeName"))
                 if array:
                     field.array = True
                     field.value = []
                     array = False
+                else:
+                    field.value = get_default_value(field.uatype, enums)
                 struct.fields.append(field)
             self.model.append(struct)
 
@@ -186,10 +236,12 @@ class StructGenerator(object):
         _file.close()
 
     def _make_registration(self):
-        code = "\n\n"
+        buf = io.StringIO()
+        w = buf.write
+        w("\n\n")
         for struct in self.model:
-            code += f"ua.register_extension_object('{struct.name}', ua.NodeId.from_string('{struct.typeid}'), {struct.name})\n"
-        return code
+            w(f"ua.register_extension_object('{struct.name}', ua.NodeId.from_string('{struct.typeid}'), {struct.name})\n")
+        return buf.getvalue()
 
     def get_python_classes(self, env=None):
         return _generate_python_class(self.model, env=env)
@@ -231,8 +283,9 @@ async def load_type_definitions(server, nodes=None):
 
     structs_dict = {}
     generators = []
-    for node in nodes:
-        xml = await node.read_value()
+    # the dictionaries are independent, download them concurrently
+    xmls = await asyncio.gather(*[node.read_value() for node in nodes])
+    for node, xml in zip(nodes, xmls):
         generator = StructGenerator()
         generators.append(generator)
         generator.make_model_from_string(xml)
@@ -247,10 +300,11 @@ async def load_type_definitions(server, nodes=None):
 
         # register classes
         # every children of our node should represent a class
-        for ndesc in await node.get_children_descriptions():
-            ndesc_node = server.get_node(ndesc.NodeId)
-            ref_desc_list = await ndesc_node.get_references(refs=ua.ObjectIds.HasDescription,
-                direction=ua.BrowseDirection.Inverse)
+        ndescs = await node.get_children_descriptions()
+        ref_desc_lists = await get_nodes_references([server.get_node(ndesc.NodeId) for ndesc in ndescs],
+                                                    refs=ua.ObjectIds.HasDescription,
+                                                    direction=ua.BrowseDirection.Inverse)
+        for ndesc, ref_desc_list in zip(ndescs, ref_desc_lists):
             if ref_desc_list:  # some server put extra things here
                 name = _clean_name(ndesc.BrowseName.Name)
                 if not name in structs_dict:
@@ -264,27 +318,52 @@ async def load_type_definitions(server, nodes=None):
         for key, val in structs_dict.items():
             if isinstance(val, EnumMeta) and key != "IntEnum":
                 setattr(ua, key, val)
+        _enum_default.cache_clear()
 
     return generators, structs_dict
 
 
+@lru_cache(maxsize=4096)
 def _clean_name(name):
     """
     Remove characters that might be present in  OPC UA structures
     but cannot be part of of Python class names
     """
-    name = re.sub(r'\W+', '_', name)
-    name = re.sub(r'^[0-9]+', r'_\g<0>', name)
+    name = _NON_WORD_RE.sub('_', name)
+    name = _LEADING_DIGIT_RE.sub(r'_\g<0>', name)
 
     return name
 
 
+@lru_cache(maxsize=None)
+def _resolve_uatype(typename):
+    """
+    Python usable type name of a field TypeName attribute,
+    the same few standard types are used by most fields of all structures
+    """
+    if ":" in typename:
+        typename = typename.split(":")[1]
+    return _clean_name(typename)
+
+
+def _compile_code(code, name):
+    # each compiled definition gets its own file name, a changed definition with the
+    # same name must not replace the source lines of the class generated before it
+    filename = f"<generated {name} #{next(_CODE_COUNTER)}>"
+    # no file to read the source from, give it to linecache for tracebacks
+    linecache.cache[filename] = (len(code), None, code.splitlines(True), filename)
+    return compile(code, filename, "exec")
+
+
 def _generate_python_class(model, env=None):
     """
     generate Python code and execute in a new environment
     return a dict of structures {name: class}
-    Rmw: Since the code is generated on the fly, in case of error the stack trace is
-    not available and debugging is very hard...
+    Classes are cached by definition, an element identical to one already generated
+    reuses the existing class instead of generating and executing its code again.
+    The cache keeps the last _CLASS_CACHE_SIZE definitions, see clear_class_cache.
+    The generated source is registered in linecache, so stack traces through
+    generated code show a "<generated Name #N>" file with its source lines.
     """
     if env is None:
         env = {}
@@ -299,11 +378,30 @@ def _generate_python_class(model, env=None):
         env['IntEnum'] = IntEnum
     # generate classes one by one and add them to dict
     for element in model:
-        code = element.get_code()
-        exec(code, env)
+        key = element.cache_key()
+        cached = _CLASS_CACHE.get(key)
+        if cached is None:
+            code = _compile_code(element.get_code(), element.name)
+            exec(code, env)
+            _CLASS_CACHE[key] = (env[element.name], code.co_filename)
+            if len(_CLASS_CACHE) > _CLASS_CACHE_SIZE:
+                _, (_, filename) = _CLASS_CACHE.popitem(last=False)
+                linecache.cache.pop(filename, None)
+        else:
+            _CLASS_CACHE.move_to_end(key)
+            env[element.name] = cached[0]
     return env
 
 
+def clear_class_cache():
+    """
+    forget all classes generated so far, the next load generates them again
+    """
+    for _, filename in _CLASS_CACHE.values():
+        linecache.cache.pop(filename, None)
+    _CLASS_CACHE.clear()
+
+
 async def load_enums(server, env=None):
     """
     Read enumeration data types on server and generate python Enums in ua scope for them
@@ -312,20 +410,27 @@ async def load_enums(server, env=None):
     nodes = await server.nodes.enum_data_type.get_children()
     if env is None:
         env = ua.__dict__
-    for node in nodes:
-        name = (await node.read_browse_name()).Name
-        try:
-            c = await _get_enum_strings(name, node)
-        except ua.UaError as ex:
-            try:
-                c = await _get_enum_values(name, node)
-            except ua.UaError as ex:
-                _logger.warning("Node %s, %s under DataTypes/Enumeration, does not seem to have a child called EnumString or EumValue: %s", name, node, ex)
-                continue
+    for c in await asyncio.gather(*[_get_enum(node) for node in nodes]):
+        if c is None:
+            continue
         if not hasattr(ua, c.name):
             _logger.warning("Adding enum %s to ua namespace", c)
             model.append(c)
-    return _generate_python_class(model, env=env)
+    env = _generate_python_class(model, env=env)
+    _enum_default.cache_clear()
+    return env
+
+
+async def _get_enum(node):
+    name = (await node.read_browse_name()).Name
+    try:
+        return await _get_enum_strings(name, node)
+    except ua.UaError as ex:
+        try:
+            return await _get_enum_values(name, node)
+        except ua.UaError as ex:
+            _logger.warning("Node %s, %s under DataTypes/Enumeration, does not seem to have a child called EnumString or EumValue: %s", name, node, ex)
+            return None
 
 
 async def _get_enum_values(name, node):
@@ -162,14 +162,58 @@ async def get_node_children(node, nodes=None):
 
 
 async def get_node_subtypes(node, nodes=None):
+    """
+    Get recursively all subtypes of a node
+    The hierarchy is browsed level by level, with one browse request per level
+    """
+    from .node import Node
     if nodes is None:
         nodes = [node]
-    for child in await node.get_children(refs=ua.ObjectIds.HasSubtype):
-        nodes.append(child)
-        await get_node_subtypes(child, nodes)
+    level = [node]
+    while level:
+        refs_per_node = await get_nodes_references(level, refs=ua.ObjectIds.HasSubtype,
+                                                   direction=ua.BrowseDirection.Forward)
+        level = [Node(node.server, ref.NodeId) for refs in refs_per_node for ref in refs]
+        nodes.extend(level)
     return nodes
 
 
+async def get_nodes_references(nodes, refs=ua.ObjectIds.References, direction=ua.BrowseDirection.Both,
+                               nodeclassmask=ua.NodeClass.Unspecified, includesubtypes=True, max_nodes_per_browse=50):
+    """
+    returns references of several nodes, browsing up to max_nodes_per_browse nodes per request
+    Paramters are the same as for Node.get_references, all nodes must belong to the same server.
+    max_nodes_per_browse should not exceed the MaxNodesPerBrowse operation limit of the server
+    :returns a list of references for each node
+    """
+    from .node import _to_nodeid
+    references = []
+    for start in range(0, len(nodes), max_nodes_per_browse):
+        batch = nodes[start:start + max_nodes_per_browse]
+        params = ua.BrowseParameters()
+        params.View.Timestamp = ua.get_win_epoch()
+        params.RequestedMaxReferencesPerNode = 0
+        for node in batch:
+            desc = ua.BrowseDescription()
+            desc.BrowseDirection = direction
+            desc.ReferenceTypeId = _to_nodeid(refs)
+            desc.IncludeSubtypes = includesubtypes
+            desc.NodeClassMask = nodeclassmask
+            desc.ResultMask = ua.BrowseResultMask.All
+            desc.NodeId = node.nodeid
+            params.NodesToBrowse.append(desc)
+        results = await batch[0].server.browse(params)
+        # continuation points of a batch are consumed before browsing the next one
+        for node, result in zip(batch, results):
+            if result.StatusCode.value == ua.StatusCodes.BadNoContinuationPoints:
+                # the server ran out of continuation points for this batch, browse the node alone
+                references.append(await node.get_references(refs, direction, nodeclassmask, includesubtypes))
+                continue
+            result.StatusCode.check()
+            references.append(await node._browse_next([result]))
+    return references
+
+
 async def get_node_supertypes(node, includeitself=False, skipbase=True):
     """
     return get all subtype parents of node recursive
@@ -6,6 +6,7 @@ import logging
 import uuid
 from typing import Coroutine, Union, Dict
 from copy import copy
+from collections import deque
 
 from asyncua import ua
 from .xmlparser import XMLParser, ua_type_to_python
@@ -411,21 +412,27 @@ class XmlImporter:
         """
 
         sorted_ndatas = []
-        sorted_nodes_ids = []
-        all_node_ids = [data.nodeid for data in ndatas]
-        while ndatas:
-            for ndata in ndatas[:]:
-                if ndata.nodeid.NamespaceIndex not in self.namespaces or \
-                        ndata.parent is None or \
-                        ndata.parent not in all_node_ids:
+        sorted_nodes_ids = set()
+        all_node_ids = set(data.nodeid for data in ndatas)
+        # nodes whose parent is not sorted yet, by parent nodeid
+        waiting = {}
+        for ndata in ndatas:
+            if ndata.nodeid.NamespaceIndex not in self.namespaces or \
+                    ndata.parent is None or \
+                    ndata.parent not in all_node_ids or \
+                    ndata.parent in sorted_nodes_ids:
+                # the node can be inserted, and so can the nodes waiting for it
+                ready = deque([ndata])
+                while ready:
+                    ndata = ready.popleft()
                     sorted_ndatas.append(ndata)
-                    sorted_nodes_ids.append(ndata.nodeid)
-                    ndatas.remove(ndata)
-                else:
-                    # Check if the nodes parent is already in the list of
-                    # inserted nodes
-                    if ndata.parent in sorted_nodes_ids:
-                        sorted_ndatas.append(ndata)
-                        sorted_nodes_ids.append(ndata.nodeid)
-                        ndatas.remove(ndata)
+                    sorted_nodes_ids.add(ndata.nodeid)
+                    ready.extend(waiting.pop(ndata.nodeid, ()))
+            else:
+                waiting.setdefault(ndata.parent, []).append(ndata)
+        if waiting:
+            # only possible with circular parent relations
+            remaining = [ndata for children in waiting.values() for ndata in children]
+            self.logger.warning("Could not sort nodes by parent, circular dependency between: %s", remaining)
+            sorted_ndatas.extend(remaining)
         return sorted_ndatas
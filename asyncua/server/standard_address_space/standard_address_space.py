@@ -1,12 +1,5 @@
 
-from .standard_address_space_part3 import create_standard_address_space_Part3
-from .standard_address_space_part4 import create_standard_address_space_Part4
-from .standard_address_space_part5 import create_standard_address_space_Part5
-from .standard_address_space_part8 import create_standard_address_space_Part8
-from .standard_address_space_part9 import create_standard_address_space_Part9
-from .standard_address_space_part10 import create_standard_address_space_Part10
-from .standard_address_space_part11 import create_standard_address_space_Part11
-from .standard_address_space_part13 import create_standard_address_space_Part13
+from functools import partial
 
 
 class PostponeReferences:
@@ -30,15 +23,40 @@ class PostponeReferences:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         if exc_type is None and exc_val is None:
-            remaining_nodes = list(self.server.try_add_nodes(self.postponed_nodes, check=False))
+            remaining_nodes = _retry_until_stable(partial(self.server.try_add_nodes, check=False),
+                                                  self.postponed_nodes)
             if len(remaining_nodes):
                 raise RuntimeError(f"There are remaining nodes: {remaining_nodes!r}")
-            remaining_refs = list(self.server.try_add_references(self.postponed_refs))
+            remaining_refs = _retry_until_stable(self.server.try_add_references, self.postponed_refs)
             if len(remaining_refs):
                 raise RuntimeError(f"There are remaining refs: {remaining_refs!r}")
 
 
+def _retry_until_stable(try_add, items):
+    """
+    Retry adding items until none is left or a pass adds nothing,
+    items may depend on other postponed items in any order.
+    Returns the items that could not be added
+    """
+    remaining = list(items)
+    while remaining:
+        failed = list(try_add(remaining))
+        if len(failed) == len(remaining):
+            break
+        remaining = failed
+    return remaining
+
+
 def fill_address_space(nodeservice):
+    # the generated modules are large and slow to import, only import them when they are used
+    from .standard_address_space_part3 import create_standard_address_space_Part3
+    from .standard_address_space_part4 import create_standard_address_space_Part4
+    from .standard_address_space_part5 import create_standard_address_space_Part5
+    from .standard_address_space_part8 import create_standard_address_space_Part8
+    from .standard_address_space_part9 import create_standard_address_space_Part9
+    from .standard_address_space_part10 import create_standard_address_space_Part10
+    from .standard_address_space_part11 import create_standard_address_space_Part11
+    from .standard_address_space_part13 import create_standard_address_space_Part13
     with PostponeReferences(nodeservice) as server:
         create_standard_address_space_Part3(server)
         create_standard_address_space_Part4(server)
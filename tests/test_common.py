@@ -942,6 +942,27 @@ async def test_supertypes(opc):
     assert dtype == node
 
 
+async def test_subtypes(opc):
+    ninteger = opc.opc.get_node(ua.ObjectIds.Integer)
+    dtype = await ninteger.add_data_type(2, "MyCustomSubtype")
+    dtype2 = await dtype.add_data_type(2, "MyCustomSubtype2")
+    nodes = await ua_utils.get_node_subtypes(ninteger)
+    assert ninteger == nodes[0]
+    for node in (opc.opc.get_node(ua.ObjectIds.Int32), opc.opc.get_node(ua.ObjectIds.Int64), dtype, dtype2):
+        assert node in nodes
+
+    refs = await ua_utils.get_nodes_references([dtype, dtype2], refs=ua.ObjectIds.HasSubtype,
+                                               direction=ua.BrowseDirection.Forward)
+    assert [[ref.NodeId for ref in node_refs] for node_refs in refs] == [[dtype2.nodeid], []]
+    # split over several browse requests
+    refs = await ua_utils.get_nodes_references([dtype, dtype2, dtype], refs=ua.ObjectIds.HasSubtype,
+                                               direction=ua.BrowseDirection.Forward, max_nodes_per_browse=2)
+    assert [[ref.NodeId for ref in node_refs] for node_refs in refs] == [[dtype2.nodeid], [], [dtype2.nodeid]]
+    # a failing browse is an error, not an empty list of references
+    with pytest.raises(ua.UaStatusCodeError):
+        await ua_utils.get_nodes_references([dtype, opc.opc.get_node(ua.NodeId(999999, 2))])
+
+
 async def test_base_data_type(opc):
     nint32 = opc.opc.get_node(ua.ObjectIds.Int32)
     dtype = await nint32.add_data_type(0, "MyCustomDataType")
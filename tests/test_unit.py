@@ -21,7 +21,9 @@ from asyncua.server.monitored_item_service import WhereClauseEvaluator
 from asyncua.common.event_objects import BaseEvent
 from asyncua.common.ua_utils import string_to_val, val_to_string
 from asyncua.ua.uatypes import _MaskEnum
-from asyncua.common.structures import StructGenerator
+from asyncua.common.structures import StructGenerator, clear_class_cache
+from asyncua.common.xmlimporter import XmlImporter
+from asyncua.common.xmlparser import NodeData
 from asyncua.common.connection import MessageChunk
 
 EXAMPLE_BSD_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "example.bsd"))
@@ -64,7 +66,7 @@ def test_custom_structs(tmpdir):
 
     # set some values
     v = ns["ScalarValueDataType"]()
-    v.SbyteValue = 1
+    v.SByteValue = 1
     v.ByteValue = 2
     v.Int16Value = 3
     v.UInt16Value = 4
@@ -112,7 +114,7 @@ def test_custom_structs_array(tmpdir):
 
     # set some values
     v = ns["ArrayValueDataType"]()
-    v.SbyteValue = [1]
+    v.SByteValue = [1]
     v.ByteValue = [2]
     v.Int16Value = [3]
     v.UInt16Value = [4]
@@ -134,6 +136,34 @@ def test_custom_structs_array(tmpdir):
     # print(v2.NodeIdValue)
 
 
+def test_custom_structs_class_cache():
+    c = StructGenerator()
+    c.make_model_from_file(EXAMPLE_BSD_PATH)
+    ns = c.get_python_classes()
+    c2 = StructGenerator()
+    c2.make_model_from_file(EXAMPLE_BSD_PATH)
+    ns2 = c2.get_python_classes()
+    # identical definitions reuse the already generated class
+    assert ns["ScalarValueDataType"] is ns2["ScalarValueDataType"]
+    c2.model[0].fields.pop()
+    ns3 = c2.get_python_classes()
+    assert ns3["ScalarValueDataType"] is not ns["ScalarValueDataType"]
+    clear_class_cache()
+    ns4 = c.get_python_classes()
+    assert ns4["ScalarValueDataType"] is not ns["ScalarValueDataType"]
+
+
+def test_custom_structs_slots():
+    c = StructGenerator()
+    c.make_model_from_file(EXAMPLE_BSD_PATH)
+    ns = c.get_python_classes()
+    v = ns["ScalarValueDataType"]()
+    assert "Int32Value: 0" in str(v)
+    # generated structures only accept their fields
+    with pytest.raises(AttributeError):
+        v.Int32Valeu = 1
+
+
 def test_nodeid_nsu():
     n = ua.NodeId(100, 2)
     n.NamespaceUri = "http://freeopcua/tests"
@@ -702,3 +732,21 @@ def test_variant_intenum():
     ase = ua.AxisScaleEnumeration(ua.AxisScaleEnumeration.Linear)  # Just pick an existing IntEnum class
     vAse = ua.Variant(ase)
     assert vAse.VariantType == ua.VariantType.Int32
+
+
+def test_xml_sort_nodes_by_parentid():
+    def make_ndata(nodeid, parent=None):
+        ndata = NodeData()
+        ndata.nodeid = ua.NodeId(nodeid, 1)
+        ndata.parent = ua.NodeId(parent, 1) if parent else None
+        return ndata
+
+    importer = XmlImporter(None)
+    importer.namespaces = {1: 1}
+    # children listed before their parents
+    grandchild = make_ndata(3, parent=2)
+    child = make_ndata(2, parent=1)
+    root = make_ndata(1, parent=100)
+    other = make_ndata(4)
+    ndatas = importer._sort_nodes_by_parentid([grandchild, child, root, other])
+    assert ndatas == [root, child, grandchild, other]